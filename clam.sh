@@ -123,12 +123,10 @@ get_command_history() {
 }
 
 get_sanitized_history() {
-    local history_output
-    history_output=$(get_command_history)
-    history_output=$(echo "$history_output" | sed -E 's/\b[[:xdigit:]]{32,40}\b/REDACTED_HASH/g')
-    history_output=$(echo "$history_output" | sed -E 's/\b[0-9a-fA-F-]{36}\b/REDACTED_UUID/g')
-    history_output=$(echo "$history_output" | sed -E 's/\b[A-Za-z0-9]{16,40}\b/REDACTED_APIKEY/g')
-    echo "$history_output"
+    get_command_history | sed -E \
+        -e 's/\b[[:xdigit:]]{32,40}\b/REDACTED_HASH/g' \
+        -e 's/\b[0-9a-fA-F-]{36}\b/REDACTED_UUID/g' \
+        -e 's/\b[A-Za-z0-9]{16,40}\b/REDACTED_APIKEY/g'
 }
 
 get_recent_files() {
@@ -194,8 +192,13 @@ build_fep_prompt() {
     local last_cmd="${CLAM_LAST_COMMAND:-$(fc -ln -1 2>/dev/null | sed 's/^[[:space:]]*//')}"
     local last_exit="${CLAM_LAST_EXIT_CODE:-$?}"
     local last_output=""
+    local context_section=""
 
     [[ -f "$CLAM_LAST_OUTPUT_FILE" ]] && last_output="$(tail -100 "$CLAM_LAST_OUTPUT_FILE")"
+    [[ -n "$user_context" ]] && context_section="
+## Additional Context from User
+$user_context
+"
 
     cat <<EOF
 # Error Recovery Request
@@ -212,10 +215,7 @@ $last_exit
 \`\`\`
 ${last_output:-"(No captured output - please describe the error)"}
 \`\`\`
-
-## Additional Context from User
-${user_context:-"(None provided)"}
-
+${context_section}
 ## Environment
 $(get_terminal_info)
 
@@ -489,20 +489,15 @@ log_api_request() {
     local user_input="$1"
     local response_body="$2"
     local input_hash=$(echo -n "$user_input" | md5sum | cut -d ' ' -f 1)
+    local usage_fields='.usage.prompt_tokens // 0, .usage.completion_tokens // 0'
     local prompt_tokens completion_tokens created api_cost
 
     if [[ "${CLAM_PROVIDER^^}" == "ANTHROPIC" ]]; then
-        prompt_tokens=$(echo "$response_body" | jq -r '.usage.input_tokens')
-        completion_tokens=$(echo "$response_body" | jq -r '.usage.output_tokens')
-    else
-        prompt_tokens=$(echo "$response_body" | jq -r '.usage.prompt_tokens')
-        completion_tokens=$(echo "$response_body" | jq -r '.usage.completion_tokens')
+        usage_fields='.usage.input_tokens // 0, .usage.output_tokens // 0'
     fi
 
-    prompt_tokens=$((prompt_tokens))
-    completion_tokens=$((completion_tokens))
-    created=$(date +%s)
-    created=$(echo "$response_body" | jq -r ".created // $created")
+    printf -v created '%(%s)T' -1
+    read -r prompt_tokens completion_tokens created <<< "$(echo "$response_body" | jq -r "[$usage_fields, .created // $created] | @tsv")"
     api_cost=$(echo "$prompt_tokens * $CLAM_API_PROMPT_COST + $completion_tokens * $CLAM_API_COMPLETION_COST" | bc)
 
     local log_file=${CLAM_LOG_FILE:-"$HOME/.clam/clam.log"}
@@ -636,16 +631,23 @@ get_fep_completion() {
     echo "$response_body"
 }
 
+list_harm_cache() {
+    local cache_dir="${CLAM_HARM_CACHE_DIR:-$HOME/.clam/harm_cache}"
+    find "$cache_dir" -maxdepth 1 -type f -name "harm-*.json" -printf '%T+ %p\n' | sort
+}
+
 detect_command_harm() {
     local command="$1"
     load_config
 
     local command_hash=$(echo -n "$command" | md5sum | cut -d ' ' -f 1)
     local cache_dir="${CLAM_HARM_CACHE_DIR:-$HOME/.clam/harm_cache}"
+    local cache_size=${CLAM_HARM_CACHE_SIZE:-100}
     local cache_file="$cache_dir/harm-$command_hash.json"
 
-    if [[ -d "$cache_dir" && -f "$cache_file" ]]; then
+    if [[ -d "$cache_dir" && "$cache_size" -gt 0 && -f "$cache_file" ]]; then
         cat "$cache_file"
+        touch "$cache_file"
         return 0
     fi
 
@@ -666,24 +668,31 @@ detect_command_harm() {
 
     local harm_data
     if [[ "${CLAM_PROVIDER^^}" == "ANTHROPIC" ]]; then
-        harm_data=$(echo "$response_body" | jq -r '.content[0].input')
+        harm_data=$(echo "$response_body" | jq -c '.content[0].input')
     elif [[ "${CLAM_PROVIDER^^}" == "GROQ" ]]; then
-        harm_data=$(echo "$response_body" | jq -r '.choices[0].message.content')
+        harm_data=$(echo "$response_body" | jq -c '.choices[0].message.content | fromjson' 2>/dev/null)
     elif [[ "${CLAM_PROVIDER^^}" == "OLLAMA" ]]; then
-        harm_data=$(echo "$response_body" | jq -r '.message.content')
+        harm_data=$(echo "$response_body" | jq -c '.message.content | fromjson' 2>/dev/null)
     else
         local arguments_string=$(echo "$response_body" | jq -r '.choices[0].message.tool_calls[0].function.arguments // .choices[0].message.content')
         harm_data=$(echo "$arguments_string" | jq -c '.')
     fi
 
-    if ! echo "$harm_data" | jq -e 'has("is_harmful")' &>/dev/null; then
+    if [[ -z "$harm_data" ]] || ! echo "$harm_data" | jq -e 'has("is_harmful")' &>/dev/null; then
         echo_error "Malformed harm detection response. Allowing command execution." >&2
         echo '{"is_harmful":false,"explanation":"Malformed response - defaulting to safe"}'
         return 0
     fi
 
-    mkdir -p "$cache_dir"
-    echo "$harm_data" > "$cache_file"
+    if [[ "$cache_size" -gt 0 ]]; then
+        mkdir -p "$cache_dir"
+        echo "$harm_data" > "$cache_dir/.harm-$command_hash.$$"
+        mv -f "$cache_dir/.harm-$command_hash.$$" "$cache_file"
+        while [[ $(list_harm_cache | wc -l) -gt "$cache_size" ]]; do
+            local oldest=$(list_harm_cache | head -n 1 | cut -d ' ' -f 2-)
+            command rm "$oldest" || true
+        done
+    fi
     echo "$harm_data"
 }
 
@@ -773,7 +782,8 @@ interactive_clam_widget() {
         fi
 
         if [[ -d "$cache_dir" && "$cache_size" -gt 0 ]]; then
-            echo "$completions" > "$cache_file"
+            echo "$completions" > "$cache_dir/.acsh-$input_hash.$$"
+            mv -f "$cache_dir/.acsh-$input_hash.$$" "$cache_file"
             while [[ $(list_cache | wc -l) -gt "$cache_size" ]]; do
                 local oldest=$(list_cache | head -n 1 | cut -d ' ' -f 2-)
                 rm "$oldest" || true
@@ -806,9 +816,12 @@ load_config() {
             if [[ $key =~ ^# ]] || [[ -z $key ]]; then
                 continue
             fi
-            key=$(echo "$key" | sed 's/^[[:space:]]*//;s/[[:space:]]*$//')
-            value=$(echo "$value" | sed 's/^[[:space:]]*//;s/[[:space:]]*$//')
-            key=$(echo "$key" | tr '[:lower:]' '[:upper:]' | sed 's/[^A-Z0-9]/_/g')
+            key="${key#"${key%%[![:space:]]*}"}"
+            key="${key%"${key##*[![:space:]]}"}"
+            value="${value#"${value%%[![:space:]]*}"}"
+            value="${value%"${value##*[![:space:]]}"}"
+            key="${key^^}"
+            key="${key//[^A-Z0-9]/_}"
             if [[ -n $value ]]; then
                 export "CLAM_$key"="$value"
             fi
@@ -1161,8 +1174,8 @@ check_command_safety() {
     fi
 
     local harm_result=$(detect_command_harm "$full_cmd" 2>/dev/null)
-    local is_harmful=$(echo "$harm_result" | jq -r '.is_harmful')
-    local explanation=$(echo "$harm_result" | jq -r '.explanation')
+    local is_harmful explanation
+    { read -r is_harmful; read -r explanation; } <<< "$(echo "$harm_result" | jq -r '.is_harmful, (.explanation | tostring | gsub("\n"; " "))')"
 
     unset _CLAM_IN_SAFEGUARD
 
@@ -1201,6 +1214,7 @@ enable_safeguards() {
 
     export -f check_command_safety
     export -f detect_command_harm
+    export -f list_harm_cache
     export -f load_config
     export -f build_harm_detection_payload
     export -f echo_error